@@ -1,3 +1,4 @@
+import ast
 import sys
 import numpy as np
 import trimesh
@@ -5,7 +6,8 @@ import pyvista as pv
 from PyQt6 import QtWidgets, QtCore, QtGui
 from pyvistaqt import QtInteractor
 
-DEFAULT_CODE = """import trimesh
+DEFAULT_CODE = """import functools
+import trimesh
 import numpy as np
 
 # [PARAMETERS]
@@ -18,24 +20,115 @@ parameters = {
     'resolution': (64, 32, 128)         # Radial segments
 }
 
-def generate(params):
-    # --- Unpack Parameters ---
-    d_major = params['diameter_m']
-    length = params['length']
-    pitch = params['pitch']
-    hex_flats = params['head_size']
-    head_h = params['head_height']
-    res = int(params['resolution'])
+@functools.lru_cache(maxsize=2)
+def _faces(rows, cols):
+    # Connectivity depends only on the grid shape, so build it once per
+    # (rows, cols) and share the (read-only) result between calls
+    idx = np.arange(rows * cols, dtype=np.int32).reshape((rows, cols))
+    # Wrap-around neighbour column as an index array (no np.roll copies)
+    col_next = np.arange(1, cols + 1, dtype=np.int32)
+    col_next[-1] = 0
     
-    # --- Derived Dimensions ---
-    # Hexagon radius (center to corner) = flats / sqrt(3)
-    head_radius = hex_flats / np.sqrt(3)
+    c = idx[:-1, :].ravel()
+    cn = idx[:-1, col_next].ravel()
+    n = idx[1:, :].ravel()
+    nn = idx[1:, col_next].ravel()
     
-    # ISO Thread Depth Approximation
-    thread_depth = 0.613 * pitch 
-    d_minor = d_major - (2 * thread_depth)
+    # Write both triangles of each quad straight into one interleaved array
+    m = c.shape[0]
+    faces = np.empty((2 * m, 3), dtype=np.int32)
+    faces[0::2, 0] = c
+    faces[0::2, 1] = cn
+    faces[0::2, 2] = nn
+    faces[1::2, 0] = c
+    faces[1::2, 1] = nn
+    faces[1::2, 2] = n
+    faces.flags.writeable = False
+    return faces
+
+# Scratch arrays reused across calls while the grid shape stays the same
+_scratch = {}
+
+def _buf(name, shape, dtype):
+    buf = _scratch.get(name)
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        buf = _scratch[name] = np.empty(shape, dtype)
+    return buf
+
+def _build_thread(theta, z_vals, pitch, thread_depth, r_base, taper_len, out_xyz):
+    rows, cols = len(z_vals), len(theta)
+    # Theta varies along columns, Z along rows: keep them 1-D and let
+    # broadcasting expand to (rows, cols) only where needed
+    theta_row = theta[None, :]
+    z_col = z_vals[:, None]
+    # Angles don't vary with Z, so cos/sin are evaluated once per column
+    # (cols values) and broadcast down the rows, never on the full grid
+    ct = np.cos(theta_row)
+    st = np.sin(theta_row)
     
-    # --- 1. Generate The Hex Head ---
+    # Calculate Thread Profile (Triangle Wave)
+    # 1. Normalize angle and Z to find phase
+    angle_norm = theta_row * (1.0 / (2*np.pi))
+    z_pitch_norm = z_col * (1.0 / pitch)
+    
+    # 2. Helix Phase (0.0 to 1.0); x - floor(x) == x % 1.0 without the fmod path
+    helix_phase = _buf('helix_phase', (rows, cols), out_xyz.dtype)
+    floor_buf = _buf('floor', (rows, cols), out_xyz.dtype)
+    np.subtract(z_pitch_norm, angle_norm, out=helix_phase)
+    np.floor(helix_phase, out=floor_buf)
+    helix_phase -= floor_buf
+    
+    # 3. Triangle Wave: 0->1->0 based on phase (in place: 1 - 2*|phase - 0.5|)
+    profile = helix_phase
+    profile -= 0.5
+    np.abs(profile, out=profile)
+    profile *= -2.0
+    profile += 1.0
+    
+    # 4. Taper logic (fade out threads at the bottom tip), one value per row
+    taper_mask = np.clip(z_col / taper_len, 0.0, 1.0) 
+    
+    # 5. Calculate Radius at every point, applying the taper to the thread
+    # depth and the base cylinder
+    current_r = profile
+    current_r *= thread_depth
+    current_r += r_base
+    current_r *= np.minimum(1.0, 0.8 + 0.2*taper_mask)
+    
+    # Convert Cylindrical to Cartesian, straight into the (N, 3) buffer
+    xyz = out_xyz.reshape((rows, cols, 3))
+    np.multiply(current_r, ct, out=xyz[:, :, 0])
+    np.multiply(current_r, st, out=xyz[:, :, 1])
+    xyz[:, :, 2] = z_col
+
+def _merge(parts):
+    # Write every (vertices, faces) part into one preallocated buffer, shifting
+    # face indices by the running vertex offset
+    v_total = sum(len(v) for v, f in parts)
+    f_total = sum(len(f) for v, f in parts)
+    verts = np.empty((v_total, 3), dtype=np.float32)
+    faces = np.empty((f_total, 3), dtype=np.int32)
+    v_ofs = f_ofs = 0
+    for v, f in parts:
+        nv, nf = len(v), len(f)
+        verts[v_ofs:v_ofs + nv] = v
+        np.add(f, v_ofs, out=faces[f_ofs:f_ofs + nf], casting='unsafe')
+        v_ofs += nv
+        f_ofs += nf
+    return verts, faces
+
+# Each component is memoized on just the inputs it depends on, so moving a
+# head slider never re-meshes the thread and vice versa. Results are shared
+# between calls and therefore returned read-only.
+def _freeze(vertices, faces):
+    vertices.flags.writeable = False
+    faces.flags.writeable = False
+    return vertices, faces
+
+@functools.lru_cache(maxsize=8)
+def _make_head(hex_flats, head_h):
+    # Hexagon radius (center to corner) = flats / sqrt(3)
+    head_radius = hex_flats / np.sqrt(3)
     head = trimesh.creation.cylinder(
         radius=head_radius, 
         height=head_h, 
@@ -43,12 +136,19 @@ def generate(params):
     )
     # Rotate so flats align with axes
     head.apply_transform(trimesh.transformations.rotation_matrix(np.radians(30), [0, 0, 1]))
-    # Move head to the top (Z = length)
-    # Cylinder is centered at 0, so move up by length + half height
-    head.apply_translation([0, 0, length + head_h/2])
+    # Cylinder is centered at 0, so move up by half height: the bottom of
+    # the head sits at Z=0, which is the bolt's final orientation
+    head.apply_translation([0, 0, head_h/2])
+    return _freeze(np.array(head.vertices), np.array(head.faces))
 
-    # --- 2. Generate Threaded Shaft (Mathematical Construction) ---
+# Kept small: length/pitch drags produce a new grid shape per step, and the
+# hit that matters (head-only edits) only needs the most recent thread
+@functools.lru_cache(maxsize=2)
+def _make_thread(d_major, length, pitch, res):
     # We build the mesh manually to control the spiral V-shape
+    # ISO Thread Depth Approximation
+    thread_depth = 0.613 * pitch 
+    d_minor = d_major - (2 * thread_depth)
     
     # Vertical resolution: we need enough slices to form the V-shape of the thread
     slices_per_pitch = 12
@@ -56,71 +156,62 @@ def generate(params):
     if total_slices < 2: total_slices = 2
     
     # Create Grid
-    theta = np.linspace(0, 2*np.pi, res, endpoint=False)
-    z_vals = np.linspace(0, length, total_slices)
-    theta_grid, z_grid = np.meshgrid(theta, z_vals)
+    # float32 throughout: half the memory traffic, and it is what VTK renders anyway
+    f32 = np.float32
+    theta = np.linspace(0, 2*np.pi, res, endpoint=False, dtype=f32)
+    z_vals = np.linspace(0, length, total_slices, dtype=f32)
     
-    # Calculate Thread Profile (Triangle Wave)
-    # 1. Normalize angle and Z to find phase
-    angle_norm = theta_grid / (2*np.pi)
-    z_pitch_norm = z_grid / pitch
-    
-    # 2. Helix Phase (0.0 to 1.0)
-    helix_phase = (z_pitch_norm - angle_norm) % 1.0
-    
-    # 3. Triangle Wave: 0->1->0 based on phase
-    profile = 1.0 - 2.0 * np.abs(helix_phase - 0.5)
-    
-    # 4. Taper logic (fade out threads at the bottom tip)
     taper_len = 1.5 * pitch
-    taper_mask = np.clip(z_grid / taper_len, 0.0, 1.0) 
-    
-    # 5. Calculate Radius at every point
     r_base = d_minor / 2.0
-    r_offset = thread_depth * profile
-    
-    # Apply taper to the thread depth and the base cylinder
-    current_r = (r_base + r_offset) * np.minimum(1.0, 0.8 + 0.2*taper_mask)
-    
-    # Convert Cylindrical to Cartesian
-    x = current_r * np.cos(theta_grid)
-    y = current_r * np.sin(theta_grid)
-    z = z_grid
-    
-    # Stack vertices: (N, 3)
-    vertices = np.column_stack((x.flatten(), y.flatten(), z.flatten()))
-    
-    # --- Generate Faces ---
-    rows = total_slices
-    cols = res
-    idx = np.arange(rows * cols).reshape((rows, cols))
-    
-    c = idx[:-1, :].flatten()
-    cn = np.roll(idx[:-1, :], -1, axis=1).flatten()
-    n = idx[1:, :].flatten()
-    nn = np.roll(idx[1:, :], -1, axis=1).flatten()
-    
-    f1 = np.column_stack((c, cn, nn))
-    f2 = np.column_stack((c, nn, n))
-    faces = np.vstack((f1, f2))
     
-    thread_mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
+    # Fresh buffer rather than scratch: the result is kept in the cache
+    vertices = np.empty((total_slices * res, 3), dtype=f32)
+    _build_thread(theta, z_vals, f32(pitch), f32(thread_depth), f32(r_base), f32(taper_len), vertices)
     
-    # --- 3. Cap the bottom ---
+    return _freeze(vertices, _faces(total_slices, res))
+
+@functools.lru_cache(maxsize=8)
+def _make_cap(d_minor, pitch, res):
     cap = trimesh.creation.cylinder(
         radius=d_minor/2 * 0.8, 
         height=pitch/2, 
         sections=res
     )
     cap.apply_translation([0, 0, pitch/4])
+    return _freeze(np.array(cap.vertices), np.array(cap.faces))
+
+def generate(params):
+    # --- Unpack Parameters ---
+    d_major = params['diameter_m']
+    length = params['length']
+    pitch = params['pitch']
+    hex_flats = params['head_size']
+    head_h = params['head_height']
+    res = int(params['resolution'])
+    
+    # --- Derived Dimensions ---
+    # ISO Thread Depth Approximation
+    thread_depth = 0.613 * pitch 
+    d_minor = d_major - (2 * thread_depth)
+    
+    # --- 1. Generate The Hex Head ---
+    head = _make_head(hex_flats, head_h)
+    
+    # --- 2. Generate Threaded Shaft (Mathematical Construction) ---
+    thread = _make_thread(d_major, length, pitch, res)
+    
+    # --- 3. Cap the bottom ---
+    cap = _make_cap(d_minor, pitch, res)
     
     # --- Assembly ---
-    bolt = trimesh.util.concatenate([head, thread_mesh, cap])
+    verts, faces = _merge([head, thread, cap])
     
-    # Final Orientation: Bottom of Head at Z=0
-    bolt.apply_translation([0, 0, -length])
+    # Final Orientation: Bottom of Head at Z=0 (the head is built there
+    # already; shift the shaft and cap below it)
+    verts[len(head[0]):, 2] -= length
     
-    return bolt
+    # Raw arrays go straight to the viewer; a Trimesh is only built on export
+    return verts, faces
 """
 
 class ParamSlider(QtWidgets.QWidget):
@@ -150,19 +241,78 @@ class ParamSlider(QtWidgets.QWidget):
         self.slider.valueChanged.connect(self._on_slider)
         self.input.valueChanged.connect(self._on_input)
 
+    # The spinbox holds the value; the slider only mirrors it. Slider moves
+    # are forwarded to the spinbox, so value_changed has a single source.
     def _on_slider(self, val):
-        float_val = val / self.multiplier
-        self.input.blockSignals(True)
-        self.input.setValue(float_val)
-        self.input.blockSignals(False)
-        self.value_changed.emit(self.name, float_val)
+        self.input.setValue(val / self.multiplier)
 
     def _on_input(self, val):
-        self.slider.blockSignals(True)
-        self.slider.setValue(int(val * self.multiplier))
-        self.slider.blockSignals(False)
+        slider_val = round(val * self.multiplier)
+        if self.slider.value() != slider_val:
+            with QtCore.QSignalBlocker(self.slider):
+                self.slider.setValue(slider_val)
         self.value_changed.emit(self.name, val)
 
+def mesh_arrays(result):
+    # generate() may return a trimesh-like mesh or a (vertices, faces) pair
+    if isinstance(result, tuple):
+        vertices, faces = result
+    else:
+        vertices, faces = result.vertices, result.faces
+    return np.asarray(vertices), np.asarray(faces)
+
+def fixed_normals(vertices, faces):
+    # Besides export, the only place a Trimesh is built: fix winding and get
+    # vertex normals for the offset. Returns the (possibly re-wound) faces too.
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    mesh.fix_normals()
+    return np.asarray(mesh.faces), np.asarray(mesh.vertex_normals)
+
+class GenerateSignals(QtCore.QObject):
+    # QRunnable can't emit signals itself; this bridge is created on the GUI
+    # thread so results are delivered there through a queued connection
+    result_ready = QtCore.pyqtSignal(int, object)
+    failed = QtCore.pyqtSignal(int, str)
+
+class GenerateTask(QtCore.QRunnable):
+    # Emits (vertices, faces, normals); normals is None unless requested
+    def __init__(self, job_id, generate, params, with_normals):
+        super().__init__()
+        self.job_id = job_id
+        self.generate = generate
+        self.params = params
+        self.with_normals = with_normals
+        self.signals = GenerateSignals()
+
+    def run(self):
+        try:
+            vertices, faces = mesh_arrays(self.generate(self.params))
+            normals = None
+            if self.with_normals:
+                faces, normals = fixed_normals(vertices, faces)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.result_ready.emit(self.job_id, (vertices, faces, normals))
+
+class NormalsTask(QtCore.QRunnable):
+    # Normals for geometry that is already generated, for when an offset is
+    # first set after a zero-offset regeneration
+    def __init__(self, job_id, vertices, faces):
+        super().__init__()
+        self.job_id = job_id
+        self.vertices = vertices
+        self.faces = faces
+        self.signals = GenerateSignals()
+
+    def run(self):
+        try:
+            faces, normals = fixed_normals(self.vertices, self.faces)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.result_ready.emit(self.job_id, (self.vertices, faces, normals))
+
 class LiveCADWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
@@ -171,6 +321,21 @@ class LiveCADWindow(QtWidgets.QMainWindow):
         central_widget = QtWidgets.QWidget()
         self.setCentralWidget(central_widget)
         main_layout = QtWidgets.QHBoxLayout(central_widget)
+        # Compiled `generate` callables keyed by editor text; cleared on every edit
+        self._code_cache = {}
+        # Coalesces bursts of slider/spinbox edits into a single regeneration
+        self._regen_timer = QtCore.QTimer(self)
+        self._regen_timer.setSingleShot(True)
+        self._regen_timer.setInterval(30)
+        self._regen_timer.timeout.connect(self._do_run_generation)
+        # Meshing runs off the GUI thread. A private single-thread pool keeps
+        # generate() calls serialized, since the script keeps shared scratch
+        # state between calls. Only results of the newest job are shown.
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pending_counter = 0
+        self._pending_key = None
+        self._normals_job = None
         
         left_panel = QtWidgets.QWidget()
         left_layout = QtWidgets.QVBoxLayout(left_panel)
@@ -197,11 +362,18 @@ class LiveCADWindow(QtWidgets.QMainWindow):
         offset_layout.addWidget(self.offset_spin)
         left_layout.addWidget(offset_group)
 
+        # Edge overlay is a second render pass over every face; off by default
+        self.show_edges_cb = QtWidgets.QCheckBox("Show edges")
+        self.show_edges_cb.setChecked(False)
+        self.show_edges_cb.toggled.connect(self._set_edge_visibility)
+        left_layout.addWidget(self.show_edges_cb)
+
         left_layout.addWidget(QtWidgets.QLabel("<b>Python Code</b>"))
         self.editor = QtWidgets.QTextEdit()
         self.editor.setFont(QtGui.QFont("Consolas", 10))
         self.editor.setPlainText(DEFAULT_CODE)
         self.editor.setLineWrapMode(QtWidgets.QTextEdit.LineWrapMode.NoWrap)
+        self.editor.textChanged.connect(self._code_cache.clear)
         left_layout.addWidget(self.editor)
         
         btn_layout = QtWidgets.QHBoxLayout()
@@ -220,24 +392,77 @@ class LiveCADWindow(QtWidgets.QMainWindow):
         main_layout.addWidget(self.plotter.interactor, stretch=2)
 
         self.current_params = {}
-        self.generated_mesh = None
+        # Last parsed `parameters` dict and its sliders, so a re-parse with the
+        # same layout only touches values instead of rebuilding widgets
+        self._params_def = {}
+        self._sliders = {}
+        self._rendered_code = None
+        # Un-offset output of the last generate() call, keyed by (code, params),
+        # plus its vertex normals once an offset has needed them
+        self._base_key = None
+        self._base_vertices = None
+        self._base_faces = None
+        self._base_normals = None
+        self._offset_scratch = None
+        # (vertices, faces) currently displayed; wrapped in a Trimesh on export
+        self.generated_geometry = None
+        # Live PolyData and the faces it was built from; reused while topology holds
+        self._pv_mesh = None
+        self._pv_faces = None
+        self._actor = None
         self.parse_parameters()
 
+    @staticmethod
+    def _find_parameters(code):
+        # Fast path: evaluate just a top-level `parameters = {...}` literal
+        # instead of executing the whole script.
+        for node in ast.parse(code).body:
+            if isinstance(node, ast.Assign) and any(
+                    isinstance(t, ast.Name) and t.id == 'parameters' for t in node.targets):
+                try:
+                    return ast.literal_eval(node.value)
+                except ValueError:
+                    break  # values use expressions such as np.pi/4
+        # Otherwise run the script in a scratch namespace and read it back
+        scope = dict(globals(), __name__='<editor>')
+        exec(compile(code, '<editor>', 'exec'), scope)
+        return scope.get('parameters')
+
+    @staticmethod
+    def _same_layout(old, new):
+        # Same keys, ranges and int/float kind; defaults may differ
+        if old.keys() != new.keys(): return False
+        return all(
+            tuple(old[k][1:]) == tuple(new[k][1:])
+            and isinstance(old[k][0], int) == isinstance(new[k][0], int)
+            for k in new)
+
     def parse_parameters(self):
         code = self.editor.toPlainText()
-        local_scope = {}
         try:
-            exec(code, {}, local_scope)
-            if 'parameters' not in local_scope: return
-            new_params_def = local_scope['parameters']
+            new_params_def = self._find_parameters(code)
+            if new_params_def is None: return
+            if self._same_layout(self._params_def, new_params_def):
+                for key, val in new_params_def.items():
+                    # Reset to the default; only emits value_changed (and so
+                    # schedules a regeneration) if the value actually moves
+                    self._sliders[key].input.setValue(val[0])
+                self._params_def = new_params_def
+                # Sliders already at their defaults don't warrant a rebuild; edited code does
+                if code != self._rendered_code:
+                    self.run_generation()
+                return
             for i in reversed(range(self.param_layout.count())): 
                 self.param_layout.itemAt(i).widget().setParent(None)
             self.current_params = {}
+            self._sliders = {}
             for key, val in new_params_def.items():
                 slider = ParamSlider(key, *val, isinstance(val[0], int))
                 slider.value_changed.connect(self.update_param_and_run)
                 self.param_layout.addWidget(slider)
+                self._sliders[key] = slider
                 self.current_params[key] = val[0]
+            self._params_def = new_params_def
             self.run_generation()
         except Exception as e: print(f"Error: {e}")
 
@@ -245,27 +470,121 @@ class LiveCADWindow(QtWidgets.QMainWindow):
         self.current_params[name] = value
         self.run_generation()
 
+    def _get_generate(self, code):
+        gen = self._code_cache.get(code)
+        if gen is None:
+            # Run the script in a single namespace so `generate` can see
+            # helpers and imports defined alongside it
+            scope = dict(globals(), __name__='<editor>')
+            exec(compile(code, '<editor>', 'exec'), scope)
+            gen = scope.get('generate')
+            if gen is None: return None
+            self._code_cache[code] = gen
+        return gen
+
     def run_generation(self):
+        self._regen_timer.start()
+
+    def _do_run_generation(self):
         code = self.editor.toPlainText()
-        local_scope = {}
         try:
-            exec(code, globals(), local_scope)
-            if 'generate' not in local_scope: return
-            mesh = local_scope['generate'](self.current_params)
-            offset = self.offset_spin.value()
-            if abs(offset) > 0.001:
-                mesh.fix_normals()
-                mesh.vertices += mesh.vertex_normals * offset
-            self.generated_mesh = mesh
-            self.plotter.clear()
-            self.plotter.add_mesh(mesh, color="cyan", show_edges=True, opacity=0.8)
-            self.plotter.reset_camera()
+            key = (code, tuple(sorted(self.current_params.items())))
+            if key == self._base_key:
+                # Offset-only edit (or params moved back): no meshing needed,
+                # and any job still in flight is now stale, unless it is the
+                # normals job for this very geometry
+                if self._normals_job != self._pending_counter:
+                    self._pending_counter += 1
+                self._apply_offset(code)
+                return
+            gen = self._get_generate(code)
+            if gen is None: return
+            self._pending_counter += 1
+            with_normals = abs(self.offset_spin.value()) > 0.001
+            self._start_task(key, GenerateTask(
+                self._pending_counter, gen, dict(self.current_params), with_normals))
         except Exception as e: print(f"Runtime Error: {e}")
 
+    def _start_task(self, key, task):
+        self._pending_key = key
+        task.signals.result_ready.connect(self._on_generated)
+        task.signals.failed.connect(self._on_generate_failed)
+        # Drop queued jobs that haven't started; they'd be discarded anyway
+        self._pool.clear()
+        self._pool.start(task)
+
+    def _on_generated(self, job_id, result):
+        if job_id != self._pending_counter: return
+        try:
+            self._base_key = self._pending_key
+            self._base_vertices, self._base_faces, self._base_normals = result
+            self._apply_offset(self._pending_key[0])
+        except Exception as e: print(f"Runtime Error: {e}")
+
+    def _on_generate_failed(self, job_id, message):
+        if job_id != self._pending_counter: return
+        # Let the next offset edit retry a failed normals job
+        self._normals_job = None
+        print(f"Runtime Error: {message}")
+
+    def _apply_offset(self, code):
+        # Reuses the un-offset vertices and their normals from the last
+        # generate(), so offset-only edits never re-mesh. Only the
+        # multiply/add and the VTK update run here on the GUI thread.
+        vertices = self._base_vertices
+        offset = self.offset_spin.value()
+        if abs(offset) > 0.001:
+            if self._base_normals is None:
+                # Normals are computed on the worker; this method runs again
+                # from _on_generated once they arrive
+                if self._normals_job == self._pending_counter: return
+                self._pending_counter += 1
+                self._normals_job = self._pending_counter
+                self._start_task(self._base_key, NormalsTask(
+                    self._pending_counter, vertices, self._base_faces))
+                return
+            # Scale into a reused buffer and add in place: no (V, 3) temporaries
+            scratch = self._offset_scratch
+            if scratch is None or scratch.shape != self._base_normals.shape:
+                scratch = self._offset_scratch = np.empty_like(self._base_normals)
+            np.multiply(self._base_normals, offset, out=scratch)
+            scratch += vertices
+            vertices = scratch
+        self.generated_geometry = (vertices, self._base_faces)
+        self._rendered_code = code
+        self._show_mesh(vertices, self._base_faces)
+
+    def _show_mesh(self, vertices, faces):
+        if (self._pv_mesh is not None and self._pv_mesh.n_points == len(vertices)
+                and np.array_equal(self._pv_faces, faces)):
+            # Same topology: overwrite point coordinates in place instead of
+            # rebuilding the actor and re-uploading the index buffers
+            self._pv_mesh.points = np.ascontiguousarray(vertices)
+            self._pv_mesh.Modified()
+            self.plotter.render()
+            return
+        self.plotter.clear()
+        # VTK cell array layout: [3, i, j, k] per triangle
+        cells = np.empty((len(faces), 4), dtype=np.int64)
+        cells[:, 0] = 3
+        cells[:, 1:] = faces
+        self._pv_mesh = pv.PolyData(np.ascontiguousarray(vertices), cells.ravel())
+        self._pv_faces = faces.copy()
+        self._actor = self.plotter.add_mesh(self._pv_mesh, color="cyan", show_edges=self.show_edges_cb.isChecked(), opacity=0.8)
+        self.plotter.reset_camera()
+
+    def _set_edge_visibility(self, checked):
+        # Toggle on the existing actor; no regeneration needed
+        if self._actor is None: return
+        self._actor.GetProperty().SetEdgeVisibility(checked)
+        self.plotter.render()
+
     def export_stl(self):
-        if self.generated_mesh:
+        if self.generated_geometry is not None:
             path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save STL", "", "STL (*.stl)")
-            if path: self.generated_mesh.export(path)
+            if path:
+                vertices, faces = self.generated_geometry
+                trimesh.Trimesh(vertices=vertices, faces=faces, process=False).export(path)
 
 if __name__ == "__main__":
     app = QtWidgets.QApplication(sys.argv)